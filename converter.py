@@ -3,220 +3,320 @@ converter.py — 将 arXiv 下载的 tex 文件转换为单一 Markdown 文件
 用法: python3 converter.py <arxiv_id>
 """
 
+import bisect
+import contextlib
+import json
+import os
 import re
+import socket
 import subprocess
 import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
 from pathlib import Path
 
+PANDOC_CHUNK_SIZE = 64 * 1024  # 向 pandoc stdin 分块写入的大小
+TEX_HEAD_SIZE = 8192            # 判断主 tex 文件时先读取的开头字节数
+DOCUMENTCLASS = b"\\documentclass"
+PANDOC_SERVER_TIMEOUT = 120     # pandoc server 单次转换超时（秒）
+PANDOC_SERVER_STARTUP = 5       # 等待 pandoc server 开始监听的最长时间（秒）
+
+_pandoc_server_url = None  # 由 use_pandoc_server 设置；None 时每次转换启动一个 pandoc 进程
+
+# preprocess_tex / _fix_unmatched_envs 用到的正则，模块加载时编译一次
+# 需要改写的环境：abstract / 代码块 / figure 成对处理，table 只删包装标签（不要求成对）
+_ENV_NAMES = r"abstract|lstlisting|minted|Verbatim|figure\*?|table\*?"
+# 环境边界标签：\begin{x}（group 1）或 \end{x}（group 2）；只匹配定长标签，不含 .*?
+_ENV_DELIM_RE = re.compile(rf"\\begin\{{({_ENV_NAMES})\}}|\\end\{{({_ENV_NAMES})\}}")
+# 紧跟在 \begin{x} 之后的可选参数 [...]
+_OPT_ARG_RE = re.compile(r"\[[^\]]*\]")
+# 代码块内部残留的 table 包装标签（含可选参数）
+_TABLE_TAG_RE = re.compile(r"\\begin\{table\*?\}(?:\[[^\]]*\])?|\\end\{table\*?\}")
+_LONG_DEF_RE = re.compile(r"\\(?:global\\long|long)\\def\b")
+_ORPHAN_BRACE_RE = re.compile(r"(?<= )\{(?=[^\\{\n])")
+# merge_tex：匹配 \input{...} 和 \include{...}
+_INPUT_RE = re.compile(r"\\(input|include)\{([^}]+)\}")
+# 行内注释：前面有偶数个反斜杠的 % 到行尾（\% 是字面百分号，不算注释；\\% 是换行后接注释）
+_COMMENT_RE = re.compile(r"(?<!\\)(?:\\\\)*%[^\n]*")
+_DOCUMENT_RE = re.compile(r"\\begin\{document\}(.*?)\\end\{document\}", re.DOTALL)
+# _fix_unmatched_envs：\begin{x}（group 1）、\end{x}（group 2）或一段注释；
+# 注释部分直接复用 _COMMENT_RE，两处对注释的识别保持一致
+_ENV_TOKEN_RE = re.compile(r"\\begin\{([^}\n]+)\}|\\end\{([^}\n]+)\}|" + _COMMENT_RE.pattern)
+
+
+def iter_files(root: Path):
+    """用 os.scandir 迭代遍历 root（显式栈，不跟随目录符号链接），产出所有非目录项的 (目录深度, DirEntry)。
+    直接使用 dirent 中缓存的类型信息，不构造 Path、也不额外 stat；
+    调用方按文件名筛选后再调 entry.is_file()。tex 查找与 splitter 的图片收集共用这一遍历。"""
+    stack = [(os.fspath(root), 0)]
+    while stack:
+        dir_path, depth = stack.pop()
+        try:
+            it = os.scandir(dir_path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, depth + 1))
+                else:
+                    yield depth, entry
+
+
+def _iter_tex(root: Path):
+    """产出 root 下所有 .tex 文件的 (目录深度, DirEntry)。"""
+    for depth, entry in iter_files(root):
+        if entry.name.endswith(".tex") and entry.is_file():
+            yield depth, entry
+
+
+def _has_documentclass(tex_file) -> bool:
+    """判断 tex 文件是否含 \\documentclass。
+    先只读开头 TEX_HEAD_SIZE 字节（主文件的 \\documentclass 几乎总在开头），
+    未命中且文件更长时才读剩余部分；全程按 bytes 查找，不解码、不走正则。"""
+    try:
+        with open(tex_file, "rb") as f:
+            head = f.read(TEX_HEAD_SIZE)
+            if DOCUMENTCLASS in head:
+                return True
+            if len(head) < TEX_HEAD_SIZE:
+                return False
+            rest = f.read()
+    except OSError:
+        return False
+    # 拼上 head 末尾几个字节，防止关键字恰好跨越读取边界
+    return DOCUMENTCLASS in head[-len(DOCUMENTCLASS):] + rest
 
-def find_main_tex(paper_dir: Path) -> Path:
+
+def find_main_tex(paper_dir: Path, tex_entries=None) -> Path:
     """找到含 \\documentclass 的主 tex 文件。
-    优先级：main.tex > 其他常用名 > 字符数最多的文件（正文内容最多）。
+    优先级：main.tex > 其他常用名 > 体积最大的文件（正文内容最多）。
     排除明显的模板/样式文件（名称含 template/sample/example/rebuttal）。
+    tex_entries 为调用方已遍历好的 [(目录深度, DirEntry), ...]，省略时自行遍历 paper_dir。
     """
     PREFERRED = ["main.tex", "paper.tex", "article.tex", "manuscript.tex"]
     EXCLUDE_KEYWORDS = ["template", "sample", "example", "rebuttal"]
 
-    tex_files = list(paper_dir.rglob("*.tex"))
+    # (目录深度, 字节数, 路径, 文件名)，浅层、小文件在前
+    tex_files = []
+    if tex_entries is None:
+        tex_entries = _iter_tex(paper_dir)
+    for depth, entry in tex_entries:
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            continue
+        tex_files.append((depth, size, entry.path, entry.name))
+    tex_files.sort(key=lambda item: item[:2])
 
     candidates = []
-    for tex_file in tex_files:
+    for _depth, size, tex_file, name in tex_files:
         # 排除明显的模板文件
-        if any(kw in tex_file.name.lower() for kw in EXCLUDE_KEYWORDS):
+        if any(kw in name.lower() for kw in EXCLUDE_KEYWORDS):
             continue
-        try:
-            content = tex_file.read_text(encoding="utf-8", errors="ignore")
-        except OSError:
-            continue
-        if re.search(r"\\documentclass", content):
-            candidates.append((tex_file, content))
+        if _has_documentclass(tex_file):
+            candidates.append((tex_file, name, size))
 
     if not candidates:
         # 退而求其次：不排除 template 等关键词
-        for tex_file in tex_files:
-            try:
-                content = tex_file.read_text(encoding="utf-8", errors="ignore")
-            except OSError:
-                continue
-            if re.search(r"\\documentclass", content):
-                candidates.append((tex_file, content))
+        for _depth, size, tex_file, name in tex_files:
+            if _has_documentclass(tex_file):
+                candidates.append((tex_file, name, size))
 
     if not candidates:
         raise FileNotFoundError(f"在 {paper_dir} 中未找到含 \\documentclass 的 tex 文件")
 
-    # 按优先名称排序，否则按文件内容长度降序（正文最多的最可能是主文件）
+    # 按优先名称排序，否则按文件体积降序（正文最多的最可能是主文件）
     def priority(item):
-        name = item[0].name.lower()
+        name = item[1].lower()
         if name in PREFERRED:
             return (0, PREFERRED.index(name), 0)
-        return (1, 0, -len(item[1]))
+        return (1, 0, -item[2])
 
     candidates.sort(key=priority)
-    return candidates[0][0]
-
+    return Path(candidates[0][0])
 
-def merge_tex(tex_path: Path, _visited: set = None, _root_dir: Path = None) -> str:
-    """递归内联 \\input{} / \\include{}，返回合并后的 tex 字符串。"""
-    if _visited is None:
-        _visited = set()
 
+def merge_tex(tex_path: Path) -> str:
+    """递归内联 \\input{} / \\include{}，返回合并后的 tex 字符串。
+    同一文件只读取、展开一次，重复引用与循环引用均替换为空串。
+    各文件的片段依次追加到同一个列表，最后只 join 一次，
+    避免嵌套 re.sub 在每一层都重建一遍整段字符串。"""
+    chunks = []
     tex_path = tex_path.resolve()
-    if tex_path in _visited:
-        return ""  # 防止循环引用
-    _visited.add(tex_path)
+    _merge_into(tex_path, chunks, set(), tex_path.parent)
+    return "".join(chunks)
 
-    if _root_dir is None:
-        _root_dir = tex_path.parent
+
+def _merge_into(tex_path: Path, chunks: list, visited: set, root_dir: Path):
+    """把 tex_path 展开后的内容按顺序追加到 chunks。
+    visited 记录本次合并已内联过的文件（按 resolve 后的路径）。"""
+    tex_path = tex_path.resolve()
+    if tex_path in visited:
+        return  # 已展开过，或循环引用
+    visited.add(tex_path)
 
     try:
         content = tex_path.read_text(encoding="utf-8", errors="ignore")
     except OSError:
-        return ""
+        return
 
     base_dir = tex_path.parent
-
-    def replace_input(match):
-        arg = match.group(2).strip()
+    last = 0
+    for m in _INPUT_RE.finditer(content):
+        chunks.append(content[last: m.start()])
+        last = m.end()
+        arg = m.group(2).strip()
 
         # 优先从当前文件所在目录查找，其次从根目录查找
-        for search_dir in [base_dir, _root_dir]:
+        for search_dir in [base_dir, root_dir]:
             candidate = search_dir / arg
             if not candidate.suffix:
                 candidate = candidate.with_suffix(".tex")
             if candidate.exists():
-                return merge_tex(candidate, _visited, _root_dir)
-
-        # 找不到文件时保留原命令
-        return match.group(0)
+                _merge_into(candidate, chunks, visited, root_dir)
+                break
+        else:
+            # 找不到文件时保留原命令
+            chunks.append(m.group(0))
 
-    # 匹配 \input{...} 和 \include{...}
-    pattern = re.compile(r"\\(input|include)\{([^}]+)\}")
-    return pattern.sub(replace_input, content)
+    chunks.append(content[last:])
 
 
 def preprocess_tex(tex: str) -> str:
     """预处理 tex 字符串，清理 pandoc 无法处理的结构。"""
-    # \begin{abstract}...\end{abstract} → \section*{Abstract}
-    tex = re.sub(
-        r"\\begin\{abstract\}(.*?)\\end\{abstract\}",
-        r"\\section*{Abstract}\n\1",
-        tex,
-        flags=re.DOTALL,
-    )
-    # lstlisting / minted → verbatim（pandoc 能正确识别 verbatim 为逐字内容）
-    for env in ("lstlisting", "minted", "Verbatim"):
-        tex = re.sub(
-            rf"\\begin\{{{env}\}}(?:\[.*?\])?(.*?)\\end\{{{env}\}}",
-            r"\\begin{verbatim}\1\\end{verbatim}",
-            tex,
-            flags=re.DOTALL,
-        )
-    # 完整删除 figure / figure* 环境（内含图片路径，对文字阅读无用）
-    for env in ("figure\\*", "figure"):
-        tex = re.sub(
-            rf"\\begin\{{{env}\}}.*?\\end\{{{env}\}}",
-            "",
-            tex,
-            flags=re.DOTALL,
-        )
-    # 删除 table / table* 包装标签，保留内部 tabular 和 caption 内容
-    for env in ("table\\*", "table"):
-        tex = re.sub(rf"\\begin\{{{env}\}}(?:\[.*?\])?", "", tex)
-        tex = re.sub(rf"\\end\{{{env}\}}", "", tex)
+    # 一次扫描改写 abstract / 代码块 / figure / table，详见 _rewrite_envs
+    tex = _rewrite_envs(tex)
     # \global\long\def / \long\def → \def（pandoc 不认识 \long 修饰符）
-    tex = re.sub(r"\\global\\long\\def\b", r"\\def", tex)
-    tex = re.sub(r"\\long\\def\b", r"\\def", tex)
+    tex = _LONG_DEF_RE.sub(r"\\def", tex)
     # 移除裸 { ：空格后跟 { 且后面不是 \ 或 { 的（LaTeX 源码 bug：未关闭的文本级分组）
-    tex = re.sub(r"(?<= )\{(?=[^\\{\n])", "", tex)
+    tex = _ORPHAN_BRACE_RE.sub("", tex)
     # 修复剩余不匹配的环境标签
     tex = _fix_unmatched_envs(tex)
     return tex
 
 
-def _fix_unmatched_envs(tex: str) -> str:
-    """移除无匹配对的 \\end{x}，避免 pandoc 解析错误。"""
-    lines = tex.splitlines(keepends=True)
-    result = []
-    stack = []
-
-    begin_pat = re.compile(r"\\begin\{([^}]+)\}")
-    end_pat = re.compile(r"\\end\{([^}]+)\}")
-
-    for line in lines:
-        if line.lstrip().startswith("%"):
-            result.append(line)
-            continue
-
-        pct = line.find("%")
-        code = line[:pct] if pct >= 0 else line
-
-        begins = list(begin_pat.finditer(code))
-        ends = list(end_pat.finditer(code))
+def _rewrite_envs(tex: str) -> str:
+    """一次扫描改写 abstract / 代码块 / figure / table 环境：
+      abstract      → \\section*{Abstract}（内部继续改写，可能含 table 等）
+      lstlisting 等 → verbatim（pandoc 能正确识别 verbatim 为逐字内容）
+      figure(*)     → 整段删除（内含图片路径，对文字阅读无用）
+      table 标签    → 删除包装标签，保留内部 tabular 和 caption 内容（代码块内部同样删除）
+    先用 _ENV_DELIM_RE 一次找出全部边界标签，再按位置二分查找每个 \\begin 之后
+    第一个同名 \\end 配对，等价于 \\begin{x}(.*?)\\end{x} 的最短匹配；
+    但缺少 \\end 的 \\begin 不会再让 .*? 扫到文末，总耗时与文本长度线性相关。"""
+    tokens = list(_ENV_DELIM_RE.finditer(tex))
+    if not tokens:
+        return tex
 
-        if not begins and not ends:
-            result.append(line)
+    ends = {}  # 环境名 → 该环境所有 \end 标签（按位置升序）
+    for m in tokens:
+        if m.group(2):
+            ends.setdefault(m.group(2), []).append(m)
+    end_starts = {env: [m.start() for m in ms] for env, ms in ends.items()}
+
+    pieces = []
+    cursor = 0
+    for m in tokens:
+        if m.start() < cursor:
+            continue  # 已被前面的环境整体吞掉
+        env = m.group(1) or m.group(2)
+
+        if env.startswith("table"):
+            pieces.append(tex[cursor: m.start()])
+            cursor = m.end()
+            if m.group(1):
+                opt = _OPT_ARG_RE.match(tex, cursor)
+                if opt:
+                    cursor = opt.end()
             continue
+        if m.group(2):
+            continue  # 未配对的 \end 留给 _fix_unmatched_envs 处理
+
+        starts = end_starts.get(env, [])
+        opt = _OPT_ARG_RE.match(tex, m.end())
+        content_start = opt.end() if opt else m.end()
+        k = bisect.bisect_left(starts, content_start)
+        if opt and k == len(starts):
+            # 与正则回溯一致：可选参数之后找不到 \end 时，不把 [...] 当作参数再找一次
+            opt, content_start = None, m.end()
+            k = bisect.bisect_left(starts, content_start)
+        if k == len(starts):
+            continue  # 没有对应的 \end，原样保留
+        close = ends[env][k]
+        inner = tex[content_start: close.start()]
+
+        pieces.append(tex[cursor: m.start()])
+        if env == "abstract":
+            opt_text = opt.group(0) if opt else ""
+            pieces.append("\\section*{Abstract}\n" + _rewrite_envs(opt_text + inner))
+        elif not env.startswith("figure"):
+            # 与其他位置一致，代码块里的 table 标签也删掉：不成对的 \begin{table}
+            # 留在 verbatim 内会让 _fix_unmatched_envs 误删 \end{verbatim}
+            if "{table" in inner:
+                inner = _TABLE_TAG_RE.sub("", inner)
+            pieces.append("\\begin{verbatim}" + inner + "\\end{verbatim}")
+        cursor = close.end()
+
+    pieces.append(tex[cursor:])
+    return "".join(pieces)
 
-        events = [(m.start(), "begin", m.group(1)) for m in begins] + \
-                 [(m.start(), "end",   m.group(1)) for m in ends]
-        events.sort()
 
-        drop_positions = set()
-
-        for _pos, kind, env in events:
-            if kind == "begin":
-                stack.append(env)
+def _fix_unmatched_envs(tex: str) -> str:
+    """移除无匹配对的 \\end{x}，避免 pandoc 解析错误。
+    对全文只做一次 _ENV_TOKEN_RE 扫描：注释作为整体 token 被跳过，
+    \\begin 入栈、与栈顶匹配的 \\end 出栈，其余 \\end 记录区间，最后一次拼接。"""
+    stack = []
+    pieces = []
+    last = 0
+
+    for m in _ENV_TOKEN_RE.finditer(tex):
+        begin_env, end_env = m.group(1), m.group(2)
+        if begin_env is not None:
+            stack.append(begin_env)
+        elif end_env is not None:
+            if stack and stack[-1] == end_env:
+                stack.pop()
             else:
-                if stack and stack[-1] == env:
-                    stack.pop()
-                else:
-                    drop_positions.add(_pos)
-
-        if not drop_positions:
-            result.append(line)
-            continue
+                pieces.append(tex[last: m.start()])
+                last = m.end()
 
-        new_line = line
-        offset = 0
-        for m in sorted(end_pat.finditer(code), key=lambda x: x.start()):
-            if m.start() in drop_positions:
-                s, e = m.start() + offset, m.end() + offset
-                new_line = new_line[:s] + new_line[e:]
-                offset -= (m.end() - m.start())
-        result.append(new_line)
-
-    return "".join(result)
+    if not pieces:
+        return tex
+    pieces.append(tex[last:])
+    return "".join(pieces)
 
 
 def _count_brace_depth(text: str) -> int:
     """计算文本中未闭合的 '{' 数量（忽略注释行和行内注释）。"""
-    depth = 0
-    for line in text.splitlines():
-        if line.lstrip().startswith("%"):
-            continue
-        pct = line.find("%")
-        code = line[:pct] if pct >= 0 else line
-        depth += code.count("{") - code.count("}")
-    return depth
+    code = _COMMENT_RE.sub("", text)
+    return code.count("{") - code.count("}")
 
 
 def _extract_body(tex: str, pad_braces: bool = False) -> str:
     """提取 \\begin{document} 与 \\end{document} 之间的正文，
     并用最简 preamble 重新包装，规避原始 preamble 中的语法错误。
     pad_braces=True 时才在末尾补齐未闭合的 '}'（用于 pandoc 报错后的回退）。"""
-    m = re.search(r"\\begin\{document\}(.*?)\\end\{document\}", tex, re.DOTALL)
+    m = _DOCUMENT_RE.search(tex)
     if not m:
         return tex
 
     body = m.group(1)
 
+    # 各片段收集后一次 join，正文只复制一次（逐个 + 拼接会对整篇正文反复复制）
+    minimal_preamble = "\\documentclass{article}\n"
+    parts = [minimal_preamble, "\\begin{document}\n", body]
+
     if pad_braces:
         depth = _count_brace_depth(body)
         if depth > 0:
-            body = body.rstrip("\n") + "\n" + "}" * depth + "\n"
+            parts[-1] = body.rstrip("\n")
+            parts += ["\n", "}" * depth, "\n"]
 
-    minimal_preamble = "\\documentclass{article}\n"
-    return minimal_preamble + "\\begin{document}\n" + body + "\n\\end{document}\n"
+    parts.append("\n\\end{document}\n")
+    return "".join(parts)
 
 
 def tex_to_markdown(merged_tex: str, output_path: Path) -> Path:
@@ -232,24 +332,129 @@ def tex_to_markdown(merged_tex: str, output_path: Path) -> Path:
     # 先不补 brace 直接尝试；若 pandoc 因未闭合 '{' 报错再补齐后重试
     for pad in (False, True):
         tex = _extract_body(merged_tex, pad_braces=pad)
-        result = subprocess.run(
-            cmd,
-            input=tex,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
-        if result.returncode == 0:
+        returncode = None
+        if _pandoc_server_url:
+            returncode, stderr = _run_pandoc_server(_pandoc_server_url, tex, output_path)
+        if returncode is None:
+            # 未启用 pandoc server，或与 server 通信失败时改用命令行；
+            # 转换本身报错（含超时）不再用同一个 pandoc 重跑，直接进入补括号重试
+            returncode, stderr = _run_pandoc(cmd, tex, output_path)
+        if returncode == 0:
             break
-        last_error = result.stderr
+        last_error = stderr
 
-    if result.returncode != 0:
+    if returncode != 0:
+        output_path.unlink(missing_ok=True)
         raise RuntimeError(f"pandoc 转换失败：{last_error}")
 
-    output_path.write_text(result.stdout, encoding="utf-8")
     return output_path
 
 
+def _run_pandoc(cmd: list, tex: str, output_path: Path) -> tuple:
+    """流式调用 pandoc：tex 分块写入 stdin，stdout 直接落盘到 output_path。
+    stderr 写入临时文件，避免 pandoc 大量 warning 写满管道导致互相阻塞。
+    返回 (returncode, stderr)。"""
+    data = memoryview(tex.encode("utf-8"))
+    with open(output_path, "wb") as out_f, tempfile.TemporaryFile() as err_f:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=out_f, stderr=err_f)
+        try:
+            for i in range(0, len(data), PANDOC_CHUNK_SIZE):
+                proc.stdin.write(data[i: i + PANDOC_CHUNK_SIZE])
+            proc.stdin.close()
+        except BrokenPipeError:
+            # pandoc 提前退出（通常是解析失败），以 returncode 和 stderr 为准
+            pass
+        proc.wait()
+        err_f.seek(0)
+        stderr = err_f.read().decode("utf-8", errors="ignore")
+    return proc.returncode, stderr
+
+
+def _run_pandoc_server(url: str, tex: str, output_path: Path) -> tuple:
+    """通过 pandoc server 的 JSON 接口转换，结果写入 output_path。
+    参数与 tex_to_markdown 中的命令行一致。返回 (returncode, 错误信息)：
+    转换失败或超时时 returncode 为 1；连接被拒绝/重置、响应不是 JSON 等通信故障时为 None，
+    由调用方改用命令行 pandoc。"""
+    payload = json.dumps({
+        "text": tex,
+        "from": "latex+raw_tex",
+        "to": "markdown",
+        "wrap": "none",
+    }).encode("utf-8")
+    req = urllib.request.Request(
+        url,
+        data=payload,
+        headers={"Content-Type": "application/json", "Accept": "application/json"},
+    )
+    try:
+        # 本机请求，不走环境变量中的 HTTP 代理
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        with opener.open(req, timeout=PANDOC_SERVER_TIMEOUT) as resp:
+            result = json.load(resp)
+    except urllib.error.HTTPError as e:
+        return 1, e.read().decode("utf-8", errors="ignore")
+    except (OSError, ValueError) as e:
+        # 超时说明 pandoc 在这篇上耗时过长，命令行重跑同样会卡住，按转换失败处理
+        if isinstance(e, socket.timeout) or isinstance(getattr(e, "reason", None), socket.timeout):
+            return 1, f"pandoc server 超时（{PANDOC_SERVER_TIMEOUT} 秒）"
+        return None, str(e)
+
+    # JSON 模式下转换失败（如括号不闭合）以 HTTP 200 + {"error": ...} 返回
+    if isinstance(result, dict) and "error" in result:
+        return 1, str(result["error"])
+    if not isinstance(result, dict) or not isinstance(result.get("output"), str):
+        return None, "pandoc server 响应格式异常"
+    output_path.write_text(result["output"], encoding="utf-8")
+    return 0, ""
+
+
+@contextlib.contextmanager
+def pandoc_server():
+    """启动一个常驻的 pandoc server（pandoc 3.x），产出其 URL；退出时关闭。
+    批量处理时所有论文共用这一个进程，只付一次 pandoc 启动开销。
+    pandoc 不支持 server 模式或启动失败时产出 None，调用方照常走命令行。"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    try:
+        proc = subprocess.Popen(
+            ["pandoc", "server", "--port", str(port), "--timeout", str(PANDOC_SERVER_TIMEOUT)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        yield None
+        return
+
+    try:
+        yield _wait_for_port(proc, port)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def _wait_for_port(proc: subprocess.Popen, port: int):
+    """等待 pandoc server 开始监听，返回其 URL；进程退出或超时返回 None。"""
+    deadline = time.monotonic() + PANDOC_SERVER_STARTUP
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return None
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return f"http://127.0.0.1:{port}/"
+        except OSError:
+            time.sleep(0.05)
+    return None
+
+
+def use_pandoc_server(url: str):
+    """设置本进程 tex_to_markdown 使用的 pandoc server（None 表示走命令行）。
+    可作为进程池的 initializer，让子进程共用主进程启动的 server。"""
+    global _pandoc_server_url
+    _pandoc_server_url = url
+
+
 def fix_pdf_headings(md: str) -> str:
     """将 pymupdf4llm 输出的 bold 标题格式转为标准 Markdown heading。
 
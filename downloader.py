@@ -14,36 +14,95 @@ import subprocess
 ARXIV_SRC_URL = "https://arxiv.org/src/{arxiv_id}"
 
 
-def download_arxiv_source(arxiv_id: str, data_dir: str = "./data") -> Path:
-    """下载 arXiv 源码包到 data_dir，返回压缩文件路径。"""
-    dest_dir = Path(data_dir)
-    dest_dir.mkdir(parents=True, exist_ok=True)
+USER_AGENT = "paper_split/0.1"
+DOWNLOAD_TIMEOUT = 120     # 秒
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+_http = None  # urllib3.PoolManager，首次下载时创建；同一进程内批量下载复用 TCP/TLS 连接
+
+
+def _get_http():
+    """返回模块级 urllib3 连接池；未安装 urllib3 时返回 None（改用 curl）。"""
+    global _http
+    if _http is None:
+        try:
+            import urllib3
+        except ImportError:
+            return None
+        _http = urllib3.PoolManager(
+            headers={"User-Agent": USER_AGENT},
+            timeout=DOWNLOAD_TIMEOUT,
+            retries=urllib3.Retry(3),
+        )
+    return _http
+
+
+def _download_with_urllib3(http, url: str, tmp_path: Path):
+    """用连接池下载，响应体按 1 MB 分块直接写入 tmp_path，返回 Content-Type。
+    建立连接或读取响应体时出错（连接 / TLS / 超时等）返回 None，由调用方回退到 curl。"""
+    import urllib3
 
-    url = ARXIV_SRC_URL.format(arxiv_id=arxiv_id)
-    print(f"[下载] {url}")
-
-    # 用 curl 下载，避免系统 Python LibreSSL 的 TLS 兼容性问题
+    try:
+        # decode_content=False：与 curl 一致按原样保存，不解开 Content-Encoding
+        resp = http.request("GET", url, preload_content=False, decode_content=False)
+    except urllib3.exceptions.HTTPError as e:
+        print(f"[回退] urllib3 下载失败（{e}），改用 curl")
+        return None
+    try:
+        if resp.status >= 400:
+            raise RuntimeError(f"下载失败: HTTP {resp.status} {url}")
+        try:
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(resp, f, length=DOWNLOAD_CHUNK_SIZE)
+        except urllib3.exceptions.HTTPError as e:
+            print(f"[回退] urllib3 读取响应失败（{e}），改用 curl")
+            return None
+        return resp.headers.get("Content-Type", "")
+    finally:
+        resp.release_conn()
+
+
+def _download_with_curl(url: str, tmp_path: Path) -> str:
+    """用 curl 下载到 tmp_path，返回 Content-Type。"""
     # -L 跟重定向，-s 静默，-D - 输出响应头到 stdout，-o 保存 body
-    tmp_path = dest_dir / f"{arxiv_id}.tmp"
     header_output = subprocess.run(
-        ["curl", "-L", "-s", "--max-time", "120",
+        ["curl", "-L", "-s", "--max-time", str(DOWNLOAD_TIMEOUT),
          "-D", "-",  # 响应头输出到 stdout
          "-o", str(tmp_path),
-         "-A", "paper_split/0.1",
+         "-A", USER_AGENT,
          url],
         capture_output=True, text=True
     )
     if header_output.returncode != 0:
         raise RuntimeError(f"下载失败: {header_output.stderr}")
-    if not tmp_path.exists() or tmp_path.stat().st_size == 0:
-        raise RuntimeError(f"下载结果为空: {url}")
 
     # 从响应头判断 Content-Type
-    content_type = ""
     for line in header_output.stdout.splitlines():
         if line.lower().startswith("content-type:"):
-            content_type = line.split(":", 1)[1].strip()
-            break
+            return line.split(":", 1)[1].strip()
+    return ""
+
+
+def download_arxiv_source(arxiv_id: str, data_dir: str = "./data") -> Path:
+    """下载 arXiv 源码包到 data_dir，返回压缩文件路径。
+    优先用 urllib3 连接池（批量下载时复用连接，免去每篇一次 TLS 握手和 curl 进程启动）；
+    未安装 urllib3，或其 TLS 栈不可用（如系统 Python 链接的 LibreSSL）时回退到 curl。"""
+    dest_dir = Path(data_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    url = ARXIV_SRC_URL.format(arxiv_id=arxiv_id)
+    print(f"[下载] {url}")
+
+    tmp_path = dest_dir / f"{arxiv_id}.tmp"
+    http = _get_http()
+    content_type = None
+    if http is not None:
+        content_type = _download_with_urllib3(http, url, tmp_path)
+    if content_type is None:
+        content_type = _download_with_curl(url, tmp_path)
+
+    if not tmp_path.exists() or tmp_path.stat().st_size == 0:
+        raise RuntimeError(f"下载结果为空: {url}")
 
     ext = ".tar.gz" if "tar" in content_type else ".gz"
     archive_path = dest_dir / f"{arxiv_id}{ext}"
@@ -62,15 +121,29 @@ def _is_pdf(path: Path) -> bool:
         return False
 
 
+def _is_tar_gz(path: Path) -> bool:
+    """检查 gzip 压缩包内是否为 tar（解压开头 262 字节，看偏移 257 处的 ustar 魔数）。
+    比 tarfile.is_tarfile 轻量：不会再按各种压缩格式逐一重新打开文件。"""
+    try:
+        with gzip.open(path, "rb") as gz:
+            header = gz.read(262)
+    except (OSError, EOFError):
+        return False
+    return header[257:262] == b"ustar"
+
+
 def extract_archive(archive_path: Path, extract_dir: Path) -> Path:
     """解压 tar.gz 或单个 .gz 文件到 extract_dir；若文件是 PDF 则直接保存。"""
     extract_dir.mkdir(parents=True, exist_ok=True)
 
     # 先尝试作为 tar.gz 解压
-    if tarfile.is_tarfile(archive_path):
+    if _is_tar_gz(archive_path):
         print(f"[解压] tar 格式 → {extract_dir}")
-        with tarfile.open(archive_path, "r:gz") as tf:
-            tf.extractall(path=extract_dir)
+        # 流式模式一次顺序读完，不建立可随机访问的成员索引；
+        # 'data' 过滤器拒绝越界路径并跳过无用的元数据（Python 3.12+，部分 3.8–3.11 补丁版本）
+        extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        with tarfile.open(archive_path, "r|gz") as tf:
+            tf.extractall(path=extract_dir, **extract_kwargs)
     elif _is_pdf(archive_path):
         # ArXiv 只提供 PDF（无 LaTeX 源码）
         out_file = extract_dir / (archive_path.stem + ".pdf")
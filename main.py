@@ -5,14 +5,19 @@ main.py — 一键处理 arXiv 论文或本地 PDF：下载 → 转换 → 拆
 示例: python3 main.py 2512.03043
       python3 main.py 2512.03043 2512.06673
       python3 main.py pdf_input/paper.pdf
+多个参数时每篇论文在独立进程中并行处理。
 """
 
+import contextlib
+import io
+import os
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from downloader import fetch
-from converter import convert, pdf_to_markdown
+from converter import convert, pandoc_server, pdf_to_markdown, use_pandoc_server
 from splitter import split
 
 
@@ -73,6 +78,44 @@ def process_local_pdf(pdf_path: str, data_dir: str = "./data", output_dir: str =
     return result.parent
 
 
+def process_arg(arg: str) -> Path:
+    """按参数类型分派：.pdf 路径走本地 PDF 流程，否则视为 arXiv ID。"""
+    if is_local_pdf(arg):
+        return process_local_pdf(arg)
+    return process(arg)
+
+
+def _run_task(arg: str) -> tuple:
+    """进程池任务入口：缓存本篇论文的全部输出，整体交回主进程打印，避免多篇交错。
+    返回 (日志文本, 是否成功)。"""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        try:
+            process_arg(arg)
+        except Exception as e:
+            print(f"\n[失败] {arg}: {e}")
+            return buf.getvalue(), False
+    return buf.getvalue(), True
+
+
+def process_all(args: list) -> int:
+    """并行处理多篇论文（下载、pandoc、拆分互相独立），按输入顺序打印各篇日志。
+    各子进程共用主进程启动的一个 pandoc server（不可用时各自调用命令行）。
+    返回失败篇数；单篇失败不影响其余论文。"""
+    # 重复的参数只处理一次（保持顺序），否则多个进程会同时写同一个下载文件和输出目录
+    args = list(dict.fromkeys(args))
+    workers = min(len(args), os.cpu_count() or 1)
+    failed = 0
+    with pandoc_server() as server_url, ProcessPoolExecutor(
+        max_workers=workers, initializer=use_pandoc_server, initargs=(server_url,)
+    ) as ex:
+        for log, ok in ex.map(_run_task, args):
+            print(log, end="", flush=True)
+            if not ok:
+                failed += 1
+    return failed
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("用法: python3 main.py <arxiv_id> [arxiv_id2 ...]")
@@ -80,8 +123,8 @@ if __name__ == "__main__":
         print("示例: python3 main.py 2512.03043")
         sys.exit(1)
 
-    for arg in sys.argv[1:]:
-        if is_local_pdf(arg):
-            process_local_pdf(arg)
-        else:
-            process(arg)
+    args = sys.argv[1:]
+    if len(args) == 1:
+        process_arg(args[0])
+    elif process_all(args):
+        sys.exit(1)
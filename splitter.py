@@ -3,46 +3,67 @@ splitter.py — 将 full_paper.md 按标题层级拆分为多个 MD 文件
 用法: python3 splitter.py <arxiv_id>
 """
 
+import mmap
+import os
 import re
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
-from converter import find_main_tex
+from converter import find_main_tex, iter_files
 
 
-def extract_paper_title(paper_dir: Path) -> str:
-    """从主 tex 文件中提取 \\title{} 内容，清理 LaTeX 命令后返回纯文本。"""
+# extract_paper_title / 标题清理用到的正则，模块加载时编译一次
+_TITLE_MARK = b"\\title{"
+_COMMENT_RE = re.compile(r"(?<!\\)%.*")                 # 行内注释
+_DBSLASH_MATH_RE = re.compile(r"\\\\|\$([^$]*)\$")       # \\ 换行 | $...$
+_CMD_GROUP_RE = re.compile(r"\{\\[a-zA-Z@]+(?:\{[^{}]*\})*\s*(?:\\[a-zA-Z@]+\s*)*([^{}]*)\}")  # {\cmd ... text}
+_CMD_ARG_RE = re.compile(r"\\[a-zA-Z@]+\{([^{}]*)\}")   # \cmd{...}
+_CMD_RE = re.compile(r"\\[a-zA-Z@]+")                   # 无参数命令
+_SPACING_BRACE_RE = re.compile(r"\\[!,;:.]|[{}]")      # 间距命令 | 孤立花括号
+
+
+def extract_paper_title(paper_dir: Path, tex_entries: list = None) -> str:
+    """从主 tex 文件中提取 \\title{} 内容，清理 LaTeX 命令后返回纯文本。
+    tex_entries 为 _scan_paper_dir 已收集的 tex 文件列表，省略时由 find_main_tex 自行遍历。"""
     try:
-        main_tex_path = find_main_tex(paper_dir)
-        main_tex = main_tex_path.read_text(encoding="utf-8", errors="ignore")
+        main_tex_path = find_main_tex(paper_dir, tex_entries)
+        main_tex = main_tex_path.read_bytes()
     except (FileNotFoundError, OSError):
         return None
 
-    if main_tex is None:
+    # 直接在 bytes 上定位 \title{ 并数括号（花括号均为 ASCII，不受 UTF-8 多字节影响），
+    # 只解码标题本身，不把整个主 tex 解码成 str
+    pos = main_tex.find(_TITLE_MARK)
+    if pos == -1:
         return None
 
-    # 提取 \title{...}，用括号计数处理嵌套花括号
-    m = re.search(r"\\title\{", main_tex)
-    if not m:
-        return None
-
-    start = m.end()
+    start = pos + len(_TITLE_MARK)
+    # 只在花括号位置之间跳转（bytes.find 在 C 层扫描），不逐字节走 Python 循环
     depth, i = 1, start
-    while i < len(main_tex) and depth > 0:
-        if main_tex[i] == "{":
+    next_open = main_tex.find(b"{", i)
+    while depth > 0:
+        close = main_tex.find(b"}", i)
+        if close == -1:  # 括号不闭合：取到文件末尾
+            i = len(main_tex)
+            break
+        if next_open != -1 and next_open < close:
             depth += 1
-        elif main_tex[i] == "}":
+            i = next_open + 1
+            next_open = main_tex.find(b"{", i)
+        else:
             depth -= 1
-        i += 1
-    raw = main_tex[start: i - 1]
+            i = close + 1
+    raw = main_tex[start: i - 1].decode("utf-8", errors="ignore")
 
     # 清理 LaTeX：去掉 $...$ 包裹（保留内容），去掉 \cmd{...}（保留内容），去掉 \! \\ 等
     # 先去掉注释行（以 % 开头的行）和行内注释
     lines = raw.splitlines()
     lines = [l for l in lines if not l.lstrip().startswith("%")]
-    lines = [re.sub(r"(?<!\\)%.*", "", l) for l in lines]
+    lines = [_COMMENT_RE.sub("", l) for l in lines]
     raw = " ".join(lines)
 
     title = raw
@@ -57,24 +78,33 @@ def _clean_latex_title(text: str) -> str:
         if new == text:
             break
         text = new
-    return re.sub(r"\s+", " ", text).strip()
+    return " ".join(text.split())  # 合并连续空白并去掉首尾空白
+
+
+def _dbslash_math_repl(m) -> str:
+    math = m.group(1)
+    if math is None:
+        return " "
+    # 与先整体替换 \\ 再匹配 $...$ 等价：公式内的 \\ 同样换成空格
+    return math.replace("\\\\", " ")
 
 
 def _clean_latex_title_once(text: str) -> str:
-    # \\ 换行先替换（避免干扰后续 \ 命令匹配）
-    text = re.sub(r"\\\\", " ", text)
-    # $...$ → 内容
-    text = re.sub(r"\$([^$]*)\$", lambda m: m.group(1), text)
-    # {\cmd...{args}... trailing_text} → trailing_text
-    # 匹配以 \某命令 开头的花括号组（允许命令带参数），保留尾部文本
-    text = re.sub(r"\{\\[a-zA-Z@]+(?:\{[^{}]*\})*\s*(?:\\[a-zA-Z@]+\s*)*([^{}]*)\}", r"\1", text)
-    # \cmd{...} → 内容（任意命令名）
-    text = re.sub(r"\\[a-zA-Z@]+\{([^{}]*)\}", r"\1", text)
-    # 去掉剩余的 \cmd（无参数命令和间距命令）
-    text = re.sub(r"\\[a-zA-Z@]+", "", text)
-    text = re.sub(r"\\[!,;:.]", "", text)
-    # 去掉孤立的花括号
-    text = text.replace("{", "").replace("}", "")
+    # 各步正则都要求出现 \ / $ / 花括号之一；先用 in 判断，不含时跳过整趟扫描
+    # \\ 换行 → 空格，$...$ → 内容；同一趟扫描完成，\\ 在前，避免干扰后续 \ 命令匹配
+    if "\\" in text or "$" in text:
+        text = _DBSLASH_MATH_RE.sub(_dbslash_math_repl, text)
+    if "\\" in text:
+        # {\cmd...{args}... trailing_text} → trailing_text
+        # 匹配以 \某命令 开头的花括号组（允许命令带参数），保留尾部文本
+        text = _CMD_GROUP_RE.sub(r"\1", text)
+        # \cmd{...} → 内容（任意命令名）
+        text = _CMD_ARG_RE.sub(r"\1", text)
+        # 去掉剩余的无参数命令 \cmd
+        text = _CMD_RE.sub("", text)
+    # 间距命令与孤立花括号互不重叠，合并为一趟删除
+    if "\\" in text or "{" in text or "}" in text:
+        text = _SPACING_BRACE_RE.sub("", text)
     return text
 
 
@@ -82,145 +112,256 @@ def _clean_latex_title_once(text: str) -> str:
 class Section:
     level: int          # 标题层级，# = 1, ## = 2, #### = 4
     title: str          # 原始标题文字（已去掉 {#...} 标记）
-    intro: str          # 本节引言（到第一个子节之前的内容）
+    intro: object       # 本节引言（到第一个子节之前的内容）：str；解析 bytes 输入时为 UTF-8 bytes
     children: list      # 子节列表
 
 
+_TITLE_TAG_RE = re.compile(r"\{[^}]*\}")
+
+
+@lru_cache(maxsize=1024)
 def clean_title(raw: str) -> str:
     """去掉标题中的 LaTeX 引用标记，如 {#sec:intro} {.unnumbered}"""
-    return re.sub(r"\{[^}]*\}", "", raw).strip()
+    if "{" not in raw:  # 多数标题没有标记，不进正则
+        return raw.strip()
+    return _TITLE_TAG_RE.sub("", raw).strip()
+
+
+_NON_WORD_RE = re.compile(r"[^\w\s-]")   # 非字母数字连字符
+_SPACE_US_RE = re.compile(r"[\s_]+")     # 空格/下划线
+_DASHES_RE = re.compile(r"-+")
+
+
+def _slug_char(ch: str):
+    """单个字符在 slug 中的映射：空格/下划线 → '-'，特殊字符 → 删除，其余保留。"""
+    if _SPACE_US_RE.fullmatch(ch):
+        return "-"
+    if _NON_WORD_RE.fullmatch(ch):
+        return None
+    return ch
+
+
+class _SlugTable(dict):
+    """slugify 用的 str.translate 映射表：字符映射首次用到时按 _slug_char 计算并缓存，
+    ASCII 与中文等非 ASCII 字符都走同一张表。"""
+
+    def __missing__(self, codepoint: int):
+        value = self[codepoint] = _slug_char(chr(codepoint))
+        return value
 
 
+_SLUG_TABLE = _SlugTable({c: _slug_char(chr(c)) for c in range(128)})
+
+
+@lru_cache(maxsize=1024)
 def slugify(title: str) -> str:
     """标题转文件夹/文件名：小写、空格转连字符、去特殊字符"""
-    title = clean_title(title)
-    title = title.lower()
-    title = re.sub(r"[^\w\s-]", "", title)   # 去掉非字母数字连字符
-    title = re.sub(r"[\s_]+", "-", title)     # 空格/下划线转连字符
-    title = re.sub(r"-+", "-", title)         # 合并多余连字符
+    title = clean_title(title).lower().translate(_SLUG_TABLE)
+    title = _DASHES_RE.sub("-", title)        # 合并多余连字符
     return title.strip("-")
 
 
-def parse_sections(md_text: str) -> list:
-    """将 MD 文本解析为 Section 树（只处理顶层，children 递归嵌套）。"""
-    # 找所有标题行的位置：(行起始位置, 层级, 原始标题文字)
-    heading_pattern = re.compile(r"^(#{1,6})\s+(.+)", re.MULTILINE)
-    matches = list(heading_pattern.finditer(md_text))
+# 标题行连同其后的空白（换行、空行）一起匹配，m.end() 即引言首个非空白字符；
+# # 与标题文字之间不允许跨行
+_HEADING_RE = re.compile(r"^(#{1,6})[^\S\n]+(.+)\s*", re.MULTILINE)
+_HEADING_BYTES_RE = re.compile(rb"^(#{1,6})[^\S\n]+(.+)\s*", re.MULTILINE)  # 同上，用于 UTF-8 bytes 输入
 
-    if not matches:
-        return []
 
-    # 构造 flat 列表：(start, end, level, title)
-    flat = []
-    for i, m in enumerate(matches):
-        start = m.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(md_text)
-        level = len(m.group(1))
-        title = clean_title(m.group(2))
-        flat.append((start, end, level, title, md_text[start:end]))
-
-    def build_tree(items, min_level):
-        """递归将 flat 列表构造为 Section 树。"""
-        result = []
-        i = 0
-        while i < len(items):
-            start, end, level, title, full_content = items[i]
-            if level < min_level:
-                break
-
-            # 收集属于本节的子节
-            children_items = []
-            j = i + 1
-            while j < len(items):
-                _, _, child_level, _, _ = items[j]
-                if child_level <= level:
-                    break
-                children_items.append(items[j])
-                j += 1
-
-            # 本节引言 = 本节全部内容中，去掉第一个子标题后面的部分
-            heading_line_end = full_content.index("\n") + 1 if "\n" in full_content else len(full_content)
-            intro_text = full_content[heading_line_end:]
-            if children_items:
-                first_child_start = children_items[0][0]
-                intro_text = md_text[start + heading_line_end: first_child_start]
-
-            children = build_tree(children_items, level + 1) if children_items else []
-
-            result.append(Section(
-                level=level,
-                title=title,
-                intro=intro_text.strip(),
-                children=children,
-            ))
-            i = j if children_items else i + 1
-
-        return result
-
-    return build_tree(flat, min_level=min(f[2] for f in flat))
+def _strip_unicode_ws(data: bytes) -> bytes:
+    """去掉 UTF-8 bytes 首尾的 Unicode 空白（U+00A0、U+3000、\x1c 等 bytes.strip 不认的空白），
+    与 str.strip 结果一致；只逐个解码首尾字符判断，不解码整段。"""
+    if data and 0x20 < data[0] < 0x7F and 0x20 < data[-1] < 0x7F:  # 首尾都是可见 ASCII
+        return data
+    start, end = 0, len(data)
+    while start < end:
+        lead = data[start]
+        n = 1 if lead < 0xC0 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+        if not data[start: start + n].decode("utf-8", "replace").isspace():
+            break
+        start += n
+    while end > start:
+        i = end - 1
+        while i > start and 0x80 <= data[i] < 0xC0:  # 回退到末字符的首字节
+            i -= 1
+        if not data[i:end].decode("utf-8", "replace").isspace():
+            break
+        end = i
+    return data[start:end]
+
+
+def parse_sections(md_text) -> list:
+    """将 MD 文本解析为 Section 树（返回顶层列表，children 递归嵌套）。
+    单次遍历所有标题，用栈维护当前的祖先链：遇到新标题时弹出层级不低于它的节点，
+    栈顶即为父节。本节引言 = 标题行之后到下一个标题（子节或后继节）之前的内容，
+    只按偏移切片一次，不复制整节全文。
+    md_text 也可以是 UTF-8 bytes 或 mmap：此时只解码标题，引言切片为 bytes 原样写出，正文不经过解码/编码。"""
+    is_text = isinstance(md_text, str)
+    heading_re = _HEADING_RE if is_text else _HEADING_BYTES_RE
+    roots = []
+    stack = []      # 当前祖先链，层级严格递增
+    pending = None  # (section, 引言起点)：引言终点要等下一个标题出现才确定
+
+    for m in heading_re.finditer(md_text):
+        if pending:
+            section, content_start = pending
+            # 引言开头的空白已被标题正则吞掉：只剩 rstrip；纯容器节（标题后直接是子标题）切出空串。
+            # bytes 的 \s / rstrip 只认 ASCII 空白，其余 Unicode 空白（PDF 路径常见 U+00A0 等）再单独去掉
+            intro = md_text[content_start: m.start()].rstrip()
+            section.intro = intro if is_text else _strip_unicode_ws(intro)
 
+        level = len(m.group(1))
+        title = m.group(2) if is_text else m.group(2).decode("utf-8")
+        section = Section(level=level, title=clean_title(title), intro=md_text[:0], children=[])
+        while stack and stack[-1].level >= level:
+            stack.pop()
+        (stack[-1].children if stack else roots).append(section)
+        stack.append(section)
 
-CONCLUSION_KEYWORDS = {"conclusion", "conclusions", "concluding", "concluding-remarks"}
+        pending = (section, m.end())
 
+    if pending:
+        section, content_start = pending
+        intro = md_text[content_start:].rstrip()
+        section.intro = intro if is_text else _strip_unicode_ws(intro)
 
-def is_conclusion(slug: str) -> bool:
-    return any(kw in slug for kw in CONCLUSION_KEYWORDS)
+    return roots
 
 
-IMAGE_EXTS = {".pdf", ".png", ".jpg", ".jpeg", ".eps", ".svg", ".gif"}
+CONCLUSION_KEYWORDS = {"conclusion", "conclusions", "concluding", "concluding-remarks"}
+# 关键词合成一个交替正则，一次扫描判断；不加 \b，"6conclusion" 这类编号紧贴的 slug 也要命中
+_CONCLUSION_RE = re.compile("|".join(sorted(map(re.escape, CONCLUSION_KEYWORDS))))
 
 
-def copy_figures(paper_dir: Path, figures_dir: Path):
-    """将 paper_dir 下所有图片文件平铺复制到 figures_dir。"""
-    count = 0
-    for f in paper_dir.rglob("*"):
-        if f.is_file() and f.suffix.lower() in IMAGE_EXTS:
-            shutil.copy2(f, figures_dir / f.name)
-            count += 1
-    print(f"[图片] 复制 {count} 个文件 → {figures_dir}")
+@lru_cache(maxsize=1024)
+def is_conclusion(slug: str) -> bool:
+    return _CONCLUSION_RE.search(slug) is not None
 
 
-def _write_section(section, parent_dir: Path, prefixed: str):
-    """将单个 Section 写入文件夹，递归处理子节。"""
-    section_dir = parent_dir / prefixed
-    section_dir.mkdir(parents=True, exist_ok=True)
+IMAGE_EXTS = {".pdf", ".png", ".jpg", ".jpeg", ".eps", ".svg", ".gif"}
 
-    if section.intro:
-        md_path = section_dir / f"{prefixed}.md"
-        md_path.write_text(f"# {section.title}\n\n{section.intro}\n", encoding="utf-8")
 
-    if section.children:
-        write_sections(section.children, section_dir)
+def _scan_paper_dir(root: Path) -> tuple:
+    """遍历 root 一次（converter.iter_files），同时收集 tex 文件与图片文件。
+    返回 ([(目录深度, DirEntry), ...], [(图片路径, 文件名), ...])，分别供 find_main_tex 和 copy_figures 使用。"""
+    tex_entries, images = [], []
+    for depth, entry in iter_files(root):
+        name = entry.name
+        if name.endswith(".tex"):
+            if entry.is_file():
+                tex_entries.append((depth, entry))
+            continue
+        dot = name.rfind(".")
+        if dot > 0 and name[dot:].lower() in IMAGE_EXTS and entry.is_file():
+            images.append((entry.path, name))
+    return tex_entries, images
+
+
+COPY_WORKERS = 8  # 并发复制图片的线程数
+
+
+def _copy_one(item):
+    """复制单个文件。Linux 上优先用 os.copy_file_range：数据不经过用户态，
+    支持的文件系统（btrfs、XFS 等）上还能直接 reflink；不可用、出错或未拷完时退回 shutil.copyfile。"""
+    src, dst = item
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:  # 部分文件系统 / 特殊文件不支持，提前返回 0
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+def copy_figures(paper_dir: Path, figures_dir: Path, images: list = None):
+    """将 paper_dir 下所有图片文件平铺复制到 figures_dir（只复制内容，不保留时间戳等元数据）。
+    images 为 _scan_paper_dir 已收集的图片列表，省略时自行遍历；复制用线程池并发，复制是 I/O，会释放 GIL。"""
+    if images is None:
+        images = _scan_paper_dir(paper_dir)[1]
+    # 平铺后同名文件互相覆盖：按遍历顺序保留最后一个，避免多个线程同时写同一目标
+    targets = {name: src for src, name in images}
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        list(ex.map(_copy_one, ((src, figures_dir / name) for name, src in targets.items())))
+    print(f"[图片] 复制 {len(images)} 个文件 → {figures_dir}")
+
+
+WRITE_WORKERS = 8  # 并发写 MD 文件的线程数
+
+
+def _collect_sections(sections: list, parent_dir: Path, top_level: bool = False) -> tuple:
+    """按写出规则遍历 Section 树，返回 (要创建的目录列表, [(MD 路径, UTF-8 字节), ...])，不做磁盘 I/O。
+    用显式栈代替递归：栈中每项是一组同级章节及其所在目录；父目录总先于子目录加入列表。
+    top_level=True 时，Conclusion 之后的章节放入 '{n}_appendix/' 文件夹。
+    """
+    dirs, files = [], []
+    pending = [(sections, parent_dir, top_level)]
+
+    while pending:
+        siblings, base_dir, top = pending.pop()
+        after_conclusion = False
+        conclusion_idx = 0
+        other_idx = 0
+        other_dir = None
+
+        for idx, section in enumerate(siblings):
+            slug = slugify(section.title)
+            if not slug:
+                slug = "section"
+
+            if top and after_conclusion:
+                if other_dir is None:
+                    other_dir = base_dir / f"{conclusion_idx + 1}_appendix"
+                    dirs.append(other_dir)
+                prefixed = f"{other_idx}_{slug}"
+                section_dir = other_dir / prefixed
+                other_idx += 1
+            else:
+                prefixed = f"{idx}_{slug}"
+                section_dir = base_dir / prefixed
+
+            dirs.append(section_dir)
+            intro = section.intro
+            if intro:
+                if isinstance(intro, str):
+                    intro = intro.encode("utf-8")
+                files.append((section_dir / f"{prefixed}.md", f"# {section.title}\n\n".encode("utf-8") + intro + b"\n"))
+            if section.children:
+                pending.append((section.children, section_dir, False))
+
+            if top and is_conclusion(slug):
+                after_conclusion = True
+                conclusion_idx = idx
+
+    return dirs, files
+
+
+def _write_one(item):
+    path, data = item
+    path.write_bytes(data)
 
 
 def write_sections(sections: list, parent_dir: Path, top_level: bool = False):
-    """递归将 Section 树写入文件夹结构。
-    top_level=True 时，Conclusion 之后的章节放入 '其他工作/' 文件夹。
+    """将 Section 树写入文件夹结构。
+    先遍历整棵树收集目录与文件内容，按父目录在前的顺序建好目录，
+    再用线程池并发写出所有 MD 文件；内容在遍历时已编码好，工作线程只做 open+write+close，会释放 GIL。
+    top_level=True 时，Conclusion 之后的章节放入 '{n}_appendix/' 文件夹。
     """
-    after_conclusion = False
-    conclusion_idx = 0
-    other_idx = 0
-    other_dir = None
-
-    for idx, section in enumerate(sections):
-        slug = slugify(section.title)
-        if not slug:
-            slug = "section"
-
-        if top_level and after_conclusion:
-            if other_dir is None:
-                other_dir = parent_dir / f"{conclusion_idx + 1}_appendix"
-                other_dir.mkdir()
-            prefixed = f"{other_idx}_{slug}"
-            _write_section(section, other_dir, prefixed)
-            other_idx += 1
-        else:
-            prefixed = f"{idx}_{slug}"
-            _write_section(section, parent_dir, prefixed)
+    dirs, files = _collect_sections(sections, parent_dir, top_level=top_level)
+
+    # dirs 中父目录总排在子目录之前且各不相同，逐个 mkdir 即可，
+    # 不需要 parents=True 逐级向上检查
+    parent_dir.mkdir(parents=True, exist_ok=True)
+    for d in dirs:
+        d.mkdir(exist_ok=True)
 
-        if top_level and is_conclusion(slug):
-            after_conclusion = True
-            conclusion_idx = idx
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as ex:
+        list(ex.map(_write_one, files))
 
 
 def split(arxiv_id: str, data_dir: str = "./data", output_dir: str = "./output") -> Path:
@@ -232,7 +373,9 @@ def split(arxiv_id: str, data_dir: str = "./data", output_dir: str = "./output")
         raise FileNotFoundError(f"未找到 {md_path}，请先运行 converter.py")
 
     # 提取论文标题作为文件夹名，失败则退回 arxiv_id
-    title = extract_paper_title(paper_dir)
+    # 只遍历一次论文目录，tex 与图片列表分别交给标题提取和图片复制
+    tex_entries, images = _scan_paper_dir(paper_dir)
+    title = extract_paper_title(paper_dir, tex_entries)
     folder_name = title if title else arxiv_id
     print(f"[标题] {folder_name}")
 
@@ -243,17 +386,23 @@ def split(arxiv_id: str, data_dir: str = "./data", output_dir: str = "./output")
     # 复制图片到 figures/
     figures_dir = out_paper_dir / "figures"
     figures_dir.mkdir(exist_ok=True)
-    copy_figures(paper_dir, figures_dir)
+    copy_figures(paper_dir, figures_dir, images)
 
     sections_dir = out_paper_dir / "sections"
     if sections_dir.exists():
         shutil.rmtree(sections_dir)
     sections_dir.mkdir()
 
-    md_text = md_path.read_text(encoding="utf-8")
-    print(f"[解析] {md_path}（{len(md_text)} 字符）")
-
-    sections = parse_sections(md_text)
+    # 只读 mmap 映射后按 bytes 解析：正则直接扫描页缓存，不把整篇读进 Python 堆；
+    # 只有标题需要解码，引言切片是独立的 bytes，解析完即可关闭映射
+    with open(md_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        print(f"[解析] {md_path}（{size} 字节）")
+        if size == 0:  # 空文件无法 mmap
+            sections = []
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                sections = parse_sections(mm)
     print(f"[完成] 解析出 {len(sections)} 个顶级章节")
 
     write_sections(sections, sections_dir, top_level=True)
@@ -40,6 +40,386 @@ class TestPreprocessTexStripsOrphanBraces(unittest.TestCase):
         self.assertIn("\\section{Introduction}", result)
 
 
+class TestPreprocessTexEnvironments(unittest.TestCase):
+    """preprocess_tex: abstract / 代码块 / figure / table 等环境的改写"""
+
+    def setUp(self):
+        from converter import preprocess_tex
+        self.preprocess = preprocess_tex
+
+    def test_abstract_to_section(self):
+        tex = "\\begin{abstract}\nWe study X.\n\\end{abstract}\n"
+        result = self.preprocess(tex)
+        self.assertIn("\\section*{Abstract}", result)
+        self.assertIn("We study X.", result)
+        self.assertNotIn("\\begin{abstract}", result)
+
+    def test_lstlisting_to_verbatim(self):
+        tex = "\\begin{lstlisting}[language=Python]\nx = 1\n\\end{lstlisting}\n"
+        result = self.preprocess(tex)
+        self.assertIn("\\begin{verbatim}\nx = 1\n\\end{verbatim}", result)
+
+    def test_figure_removed(self):
+        tex = "before\n\\begin{figure*}[t]\n\\includegraphics{a.png}\n\\end{figure*}\nafter\n"
+        result = self.preprocess(tex)
+        self.assertNotIn("includegraphics", result)
+        self.assertIn("before", result)
+        self.assertIn("after", result)
+
+    def test_table_wrapper_removed_tabular_kept(self):
+        tex = "\\begin{table}[h]\n\\begin{tabular}{cc}\na & b\n\\end{tabular}\n\\end{table}\n"
+        result = self.preprocess(tex)
+        self.assertNotIn("{table}", result)
+        self.assertIn("\\begin{tabular}{cc}", result)
+        self.assertIn("\\end{tabular}", result)
+
+    def test_table_tag_inside_listing_removed(self):
+        """代码块里不成对的 table 标签也删除，verbatim 保持闭合"""
+        result = self.preprocess("\\begin{minted}\\begin{table*}[h]\\end{minted}\n")
+        self.assertEqual(result, "\\begin{verbatim}\\end{verbatim}\n")
+
+    def test_table_inside_abstract_unwrapped(self):
+        """abstract 内部的 table 包装标签同样应被删除"""
+        tex = "\\begin{abstract}\n\\begin{table}\nT\n\\end{table}\n\\end{abstract}\n"
+        result = self.preprocess(tex)
+        self.assertIn("\\section*{Abstract}", result)
+        self.assertNotIn("{table}", result)
+        self.assertIn("T", result)
+
+    def test_unclosed_figure_kept(self):
+        """缺少 \\end 的 figure 应原样保留，其后的环境照常改写"""
+        tex = "\\begin{figure}\na\n\\begin{table}\nT\n\\end{table}\n"
+        result = self.preprocess(tex)
+        self.assertIn("\\begin{figure}", result)
+        self.assertNotIn("{table}", result)
+
+    def test_many_unclosed_begins_fast(self):
+        """大量未闭合的 \\begin 不应导致二次方回溯"""
+        import time
+        tex = "\\begin{figure} text\n" * 5000 + "x" * 100000
+        start = time.perf_counter()
+        self.preprocess(tex)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+    def test_long_def_normalized(self):
+        tex = "\\global\\long\\def\\foo{x}\n\\long\\def\\bar{y}\n"
+        result = self.preprocess(tex)
+        self.assertIn("\\def\\foo{x}", result)
+        self.assertIn("\\def\\bar{y}", result)
+        self.assertNotIn("\\long", result)
+
+    def test_unmatched_end_dropped(self):
+        tex = "text\n\\end{itemize}\n\\begin{center}\nx\n\\end{center}\n"
+        result = self.preprocess(tex)
+        self.assertNotIn("\\end{itemize}", result)
+        self.assertIn("\\end{center}", result)
+
+    def test_unmatched_end_mid_line_dropped(self):
+        """同一行内的多余 \\end 只删除标签本身，保留其余文字"""
+        tex = "a \\end{quote} b \\begin{x}c\\end{x} d\n"
+        result = self.preprocess(tex)
+        self.assertEqual(result, "a  b \\begin{x}c\\end{x} d\n")
+
+    def test_end_in_comment_kept(self):
+        tex = "% \\end{itemize}\ntext\n"
+        result = self.preprocess(tex)
+        self.assertIn("% \\end{itemize}", result)
+
+    def test_escaped_percent_not_comment(self):
+        r"""\% 是字面百分号，同一行其后的多余 \end 仍应删除"""
+        result = self.preprocess("50\\% \\end{itemize} x\n")
+        self.assertEqual(result, "50\\%  x\n")
+
+    def test_linebreak_before_comment(self):
+        r"""\\% 是换行后接注释：注释里的 \begin 不应入栈，后面真正的 \end 保留"""
+        tex = "\\begin{tabular}{cc}\na & b \\\\% \\begin{center} old row\n\\end{tabular}\n"
+        self.assertEqual(self.preprocess(tex), tex)
+
+
+class TestRunPandocStreaming(unittest.TestCase):
+    """_run_pandoc: tex 分块写入 stdin，stdout 直接写入输出文件（用 cat / sh 代替 pandoc）"""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def test_large_input_streamed_to_file(self):
+        """超过单块大小的输入应完整写入输出文件"""
+        from converter import _run_pandoc, PANDOC_CHUNK_SIZE
+
+        tex = "中文 text\n" * (PANDOC_CHUNK_SIZE // 4)
+        out = self.tmp / "out.md"
+        returncode, stderr = _run_pandoc(["cat"], tex, out)
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(out.read_text(encoding="utf-8"), tex)
+
+    def test_failure_returns_stderr(self):
+        """进程失败时应返回非零 returncode 与 stderr 内容"""
+        from converter import _run_pandoc
+
+        out = self.tmp / "out.md"
+        cmd = ["sh", "-c", "cat >/dev/null; echo boom >&2; exit 3"]
+        returncode, stderr = _run_pandoc(cmd, "x", out)
+
+        self.assertEqual(returncode, 3)
+        self.assertIn("boom", stderr)
+
+
+class TestFindMainTex(unittest.TestCase):
+    """find_main_tex: 按优先名称 / 体积挑选含 \\documentclass 的主文件"""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _write(self, rel, text):
+        path = self.tmp / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_preferred_name_wins(self):
+        from converter import find_main_tex
+        self._write("big.tex", "\\documentclass{article}\n" + "x" * 1000)
+        main = self._write("main.tex", "\\documentclass{article}\n")
+        self.assertEqual(find_main_tex(self.tmp), main)
+
+    def test_largest_file_wins(self):
+        from converter import find_main_tex
+        self._write("small.tex", "\\documentclass{article}\n")
+        big = self._write("big.tex", "\\documentclass{article}\n" + "x" * 1000)
+        self._write("sec/intro.tex", "x" * 5000)
+        self.assertEqual(find_main_tex(self.tmp), big)
+
+    def test_documentclass_after_head(self):
+        """\\documentclass 出现在开头 8 KB 之后也应被识别"""
+        from converter import find_main_tex, TEX_HEAD_SIZE
+        late = self._write("late.tex", "%" * (TEX_HEAD_SIZE - 3) + "\n\\documentclass{article}\n")
+        self.assertEqual(find_main_tex(self.tmp), late)
+
+    def test_template_used_as_fallback(self):
+        from converter import find_main_tex
+        tpl = self._write("template.tex", "\\documentclass{article}\n")
+        self.assertEqual(find_main_tex(self.tmp), tpl)
+
+    def test_no_documentclass_raises(self):
+        from converter import find_main_tex
+        self._write("a.tex", "hello")
+        with self.assertRaises(FileNotFoundError):
+            find_main_tex(self.tmp)
+
+
+class TestMergeTex(unittest.TestCase):
+    """merge_tex: 递归内联 \\input / \\include，每个文件只展开一次"""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _write(self, rel, text):
+        path = self.tmp / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_nested_inputs_inlined(self):
+        from converter import merge_tex
+        main = self._write("main.tex", "A\n\\input{sec/intro}\nC\n")
+        self._write("sec/intro.tex", "B1\n\\include{sec/detail.tex}\n")
+        self._write("sec/detail.tex", "B2\n")
+        self.assertEqual(merge_tex(main), "A\nB1\nB2\n\n\nC\n")
+
+    def test_shared_include_expanded_once(self):
+        from converter import merge_tex
+        main = self._write("main.tex", "\\input{macros}\n\\input{a}\n")
+        self._write("a.tex", "\\input{macros}\nA\n")
+        self._write("macros.tex", "M\n")
+        merged = merge_tex(main)
+        self.assertEqual(merged.count("M"), 1)
+        self.assertIn("A", merged)
+
+    def test_cycle_terminates(self):
+        from converter import merge_tex
+        main = self._write("main.tex", "X\n\\input{b}\n")
+        self._write("b.tex", "Y\n\\input{main}\n")
+        self.assertEqual(merge_tex(main), "X\nY\n\n\n")
+
+    def test_missing_input_kept(self):
+        from converter import merge_tex
+        main = self._write("main.tex", "\\input{nope}\n")
+        self.assertEqual(merge_tex(main), "\\input{nope}\n")
+
+
+class TestCountBraceDepth(unittest.TestCase):
+    """_count_brace_depth: 统计未闭合的 '{'，忽略注释"""
+
+    def setUp(self):
+        from converter import _count_brace_depth
+        self.count = _count_brace_depth
+
+    def test_balanced(self):
+        self.assertEqual(self.count("\\textbf{a} {b}\n"), 0)
+
+    def test_unclosed(self):
+        self.assertEqual(self.count("{a\n\\emph{b\n"), 2)
+
+    def test_comments_ignored(self):
+        self.assertEqual(self.count("% {{{\na { % }}\n  % {\n"), 1)
+
+    def test_escaped_percent_not_comment(self):
+        r"""\% 是字面百分号，其后的 { 仍应计入"""
+        self.assertEqual(self.count("50\\% {a\n"), 1)
+
+    def test_linebreak_before_comment(self):
+        r"""\\% 是换行后接注释，其后的 { 不计入"""
+        self.assertEqual(self.count("{a}\\\\% {\n"), 0)
+
+
+class TestPandocServer(unittest.TestCase):
+    """pandoc server 模式：JSON 接口调用，以及不可用时的回退"""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _serve(self, status, body):
+        """在后台线程启动一个假的 pandoc server，记录收到的请求体。"""
+        import http.server
+        import json
+        import threading
+
+        received = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                received.append(json.loads(self.rfile.read(length)))
+                self.send_response(status)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}/", received
+
+    def test_output_written(self):
+        from converter import _run_pandoc_server
+
+        url, received = self._serve(200, b'{"output": "# Intro\\n", "base64": false, "messages": []}')
+        out = self.tmp / "out.md"
+        returncode, _ = _run_pandoc_server(url, "\\section{Intro}", out)
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(out.read_text(encoding="utf-8"), "# Intro\n")
+        self.assertEqual(received[0]["from"], "latex+raw_tex")
+        self.assertEqual(received[0]["text"], "\\section{Intro}")
+
+    def test_server_error_reported(self):
+        from converter import _run_pandoc_server
+
+        url, _ = self._serve(500, b"parse error")
+        returncode, stderr = _run_pandoc_server(url, "x", self.tmp / "out.md")
+
+        self.assertEqual(returncode, 1)
+        self.assertIn("parse error", stderr)
+
+    def test_conversion_error_in_json_reported(self):
+        """JSON 模式的转换错误以 200 + {"error": ...} 返回，应作为失败交给调用方"""
+        from converter import _run_pandoc_server
+
+        url, _ = self._serve(200, b'{"error": "unexpected end of input"}')
+        out = self.tmp / "out.md"
+        returncode, stderr = _run_pandoc_server(url, "{x", out)
+
+        self.assertEqual(returncode, 1)
+        self.assertIn("unexpected end of input", stderr)
+        self.assertFalse(out.exists())
+
+    def test_transport_failure_returns_none(self):
+        """连接被拒绝或响应不是 JSON 时返回 None，由调用方改用命令行"""
+        import socket
+        from converter import _run_pandoc_server
+
+        url, _ = self._serve(200, b"<html>not json</html>")
+        self.assertIsNone(_run_pandoc_server(url, "x", self.tmp / "out.md")[0])
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        self.assertIsNone(_run_pandoc_server(f"http://127.0.0.1:{port}/", "x", self.tmp / "out.md")[0])
+
+    def _convert_with_server(self, url):
+        """用 url 作为 pandoc server 调用 tex_to_markdown，记录命令行 pandoc 的调用次数"""
+        import converter
+
+        cli_calls = []
+
+        def fake_run_pandoc(cmd, tex, output_path):
+            cli_calls.append(tex)
+            output_path.write_text("# cli\n", encoding="utf-8")
+            return 0, ""
+
+        self.addCleanup(setattr, converter, "_run_pandoc", converter._run_pandoc)
+        self.addCleanup(converter.use_pandoc_server, converter._pandoc_server_url)
+        converter._run_pandoc = fake_run_pandoc
+        converter.use_pandoc_server(url)
+        tex = "\\documentclass{article}\\begin{document}{x\\end{document}"
+        return converter.tex_to_markdown, tex, cli_calls
+
+    def test_conversion_error_not_retried_on_cli(self):
+        """server 报告的转换错误直接进入补括号重试，不再用命令行重跑"""
+        url, received = self._serve(200, b'{"error": "unexpected end of input"}')
+        convert, tex, cli_calls = self._convert_with_server(url)
+
+        with self.assertRaises(RuntimeError):
+            convert(tex, self.tmp / "out.md")
+        self.assertEqual(len(received), 2)
+        self.assertEqual(cli_calls, [])
+
+    def test_server_unreachable_falls_back_to_cli(self):
+        import socket
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        convert, tex, cli_calls = self._convert_with_server(f"http://127.0.0.1:{port}/")
+
+        out = convert(tex, self.tmp / "out.md")
+        self.assertEqual(out.read_text(encoding="utf-8"), "# cli\n")
+        self.assertEqual(len(cli_calls), 1)
+
+    def test_unavailable_yields_none(self):
+        """pandoc 不存在或不支持 server 模式时应产出 None"""
+        import shutil
+        if shutil.which("pandoc"):
+            self.skipTest("已安装 pandoc")
+
+        from converter import pandoc_server
+        with pandoc_server() as url:
+            self.assertIsNone(url)
+
+
 class TestConvertPandocWithOrphanBraces(unittest.TestCase):
     """tex_to_markdown: 含裸 { 的 tex 在预处理后应能成功转换"""
 
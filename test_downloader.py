@@ -0,0 +1,113 @@
+"""
+test_downloader.py — downloader.py 下载路径选择与回退的测试（不访问网络）
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import urllib3
+except ImportError:
+    urllib3 = None
+
+
+class FakeResponse:
+    """模拟 urllib3 的流式响应：read 依次返回 chunks，元素为异常时抛出"""
+
+    def __init__(self, status=200, chunks=(b"data",), content_type="application/x-eprint-tar"):
+        self.status = status
+        self.headers = {"Content-Type": content_type}
+        self._chunks = list(chunks)
+        self.released = False
+
+    def read(self, n=-1):
+        if not self._chunks:
+            return b""
+        chunk = self._chunks.pop(0)
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakePoolManager:
+    """模拟 urllib3.PoolManager：request 返回给定响应，或抛出给定异常"""
+
+    def __init__(self, result):
+        self.result = result
+
+    def request(self, method, url, **kwargs):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestDownloadArxivSource(unittest.TestCase):
+    """download_arxiv_source: 优先 urllib3 连接池，不可用或连接出错时回退 curl"""
+
+    def setUp(self):
+        import downloader
+        self.downloader = downloader
+        self.tmp = Path(tempfile.mkdtemp())
+        self._saved = (downloader._get_http, downloader._download_with_curl)
+        self.curl_calls = []
+
+        def fake_curl(url, tmp_path):
+            self.curl_calls.append(url)
+            Path(tmp_path).write_bytes(b"from curl")
+            return "application/x-eprint-tar"
+
+        downloader._download_with_curl = fake_curl
+
+    def tearDown(self):
+        self.downloader._get_http, self.downloader._download_with_curl = self._saved
+        shutil.rmtree(self.tmp)
+
+    def _download(self, http):
+        self.downloader._get_http = lambda: http
+        return self.downloader.download_arxiv_source("2401.00001", str(self.tmp))
+
+    def test_no_urllib3_uses_curl(self):
+        path = self._download(None)
+        self.assertEqual(len(self.curl_calls), 1)
+        self.assertEqual(path.name, "2401.00001.tar.gz")
+        self.assertEqual(path.read_bytes(), b"from curl")
+
+    @unittest.skipIf(urllib3 is None, "urllib3 未安装")
+    def test_pool_download(self):
+        resp = FakeResponse(chunks=[b"ab", b"cd"])
+        path = self._download(FakePoolManager(resp))
+        self.assertEqual(self.curl_calls, [])
+        self.assertEqual(path.read_bytes(), b"abcd")
+        self.assertTrue(resp.released)
+
+    @unittest.skipIf(urllib3 is None, "urllib3 未安装")
+    def test_http_error_status_raises(self):
+        resp = FakeResponse(status=404)
+        with self.assertRaises(RuntimeError):
+            self._download(FakePoolManager(resp))
+        self.assertEqual(self.curl_calls, [])
+        self.assertTrue(resp.released)
+
+    @unittest.skipIf(urllib3 is None, "urllib3 未安装")
+    def test_request_error_falls_back_to_curl(self):
+        error = urllib3.exceptions.MaxRetryError(None, "https://arxiv.org/src/2401.00001", "ssl")
+        path = self._download(FakePoolManager(error))
+        self.assertEqual(len(self.curl_calls), 1)
+        self.assertEqual(path.read_bytes(), b"from curl")
+
+    @unittest.skipIf(urllib3 is None, "urllib3 未安装")
+    def test_body_read_error_falls_back_to_curl(self):
+        resp = FakeResponse(chunks=[b"partial", urllib3.exceptions.ProtocolError("connection reset")])
+        path = self._download(FakePoolManager(resp))
+        self.assertEqual(len(self.curl_calls), 1)
+        self.assertEqual(path.read_bytes(), b"from curl")
+        self.assertTrue(resp.released)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -73,5 +73,27 @@ class TestDispatchByArgument(unittest.TestCase):
         self.assertFalse(is_local_pdf("2406.18530"))
 
 
+class TestBatchProcessing(unittest.TestCase):
+    """main.process_all: 多篇论文并行处理，单篇失败不影响其余论文"""
+
+    def test_run_task_reports_failure(self):
+        """找不到的 PDF 应返回失败标记，并在日志中记录原因"""
+        from main import _run_task
+        log, ok = _run_task("/nonexistent/paper.pdf")
+        self.assertFalse(ok)
+        self.assertIn("[失败] /nonexistent/paper.pdf", log)
+
+    def test_process_all_counts_failures(self):
+        from main import process_all
+        failed = process_all(["/nonexistent/a.pdf", "/nonexistent/b.pdf"])
+        self.assertEqual(failed, 2)
+
+    def test_process_all_deduplicates(self):
+        """重复的参数只处理一次"""
+        from main import process_all
+        failed = process_all(["/nonexistent/a.pdf", "/nonexistent/a.pdf"])
+        self.assertEqual(failed, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -33,6 +33,38 @@ class TestExtractArchivePdf(unittest.TestCase):
         self.assertTrue(saved.exists(), "应当在解压目录下生成 .pdf 文件")
         self.assertEqual(saved.read_bytes(), pdf_bytes)
 
+    def test_tar_gz_extracted(self):
+        """tar.gz 源码包应被解压，保留子目录结构"""
+        import io
+        import tarfile
+        from downloader import extract_archive
+
+        archive_path = self.tmp / "2401.00001.tar.gz"
+        with tarfile.open(archive_path, "w:gz") as tf:
+            for name, data in [("main.tex", b"\\documentclass{article}"), ("sec/intro.tex", b"intro")]:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+        extract_dir = self.tmp / "2401.00001"
+        extract_archive(archive_path, extract_dir)
+
+        self.assertEqual((extract_dir / "main.tex").read_bytes(), b"\\documentclass{article}")
+        self.assertEqual((extract_dir / "sec" / "intro.tex").read_bytes(), b"intro")
+
+    def test_single_gz_saved_as_tex(self):
+        """单个 .gz（非 tar）应解压为 {stem}.tex"""
+        import gzip
+        from downloader import extract_archive
+
+        archive_path = self.tmp / "2401.00002.gz"
+        archive_path.write_bytes(gzip.compress(b"\\documentclass{article}\n"))
+
+        extract_dir = self.tmp / "2401.00002"
+        extract_archive(archive_path, extract_dir)
+
+        self.assertEqual((extract_dir / "2401.00002.tex").read_bytes(), b"\\documentclass{article}\n")
+
     def test_non_pdf_non_gzip_raises(self):
         """既不是 tar/gz 也不是 PDF 时，应抛出异常"""
         from downloader import extract_archive
@@ -0,0 +1,283 @@
+"""
+test_splitter.py — splitter.py 章节解析与写出的测试
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class TestExtractPaperTitle(unittest.TestCase):
+    """extract_paper_title: 从主 tex 的 \\title{} 中提取纯文本标题"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _title(self, tex):
+        from splitter import extract_paper_title
+        (self.tmp / "main.tex").write_text(tex, encoding="utf-8")
+        return extract_paper_title(self.tmp)
+
+    def test_plain_title(self):
+        tex = "\\documentclass{article}\n\\title{A Simple Title}\n"
+        self.assertEqual(self._title(tex), "A Simple Title")
+
+    def test_nested_commands_and_math(self):
+        tex = "\\documentclass{article}\n\\title{\\textbf{Deep} $k$-Nets:\\\\ {\\em Fast} \\emph{and} Small}\n"
+        self.assertEqual(self._title(tex), "Deep k-Nets: Fast and Small")
+
+    def test_comments_removed(self):
+        tex = "\\documentclass{article}\n\\title{Real % old title\n% whole line\n Title}\n"
+        self.assertEqual(self._title(tex), "Real Title")
+
+    def test_non_ascii_title(self):
+        tex = "\\documentclass{article}\n% 注释\n\\title{基于 {\\em 图} 的方法}\n"
+        self.assertEqual(self._title(tex), "基于 图 的方法")
+
+    def test_no_title(self):
+        self.assertIsNone(self._title("\\documentclass{article}\n"))
+
+    def test_no_tex(self):
+        from splitter import extract_paper_title
+        self.assertIsNone(extract_paper_title(self.tmp))
+
+
+class TestSlugify(unittest.TestCase):
+    """slugify: 标题转为文件夹/文件名"""
+
+    def setUp(self):
+        from splitter import slugify
+        self.slugify = slugify
+
+    def test_basic(self):
+        self.assertEqual(self.slugify("2.1 Related Work"), "21-related-work")
+
+    def test_special_chars_and_underscores(self):
+        self.assertEqual(self.slugify("A/B  test_case: (v2)!"), "ab-test-case-v2")
+
+    def test_attribute_marker_removed(self):
+        self.assertEqual(self.slugify("Intro {#sec:intro}"), "intro")
+
+    def test_non_ascii_word_chars_kept(self):
+        self.assertEqual(self.slugify("数据集 Über—Analyse"), "数据集-überanalyse")
+
+    def test_only_symbols(self):
+        self.assertEqual(self.slugify("***"), "")
+
+
+class TestIsConclusion(unittest.TestCase):
+    """is_conclusion: 按 slug 中的关键词判断结论章节"""
+
+    def test_matches(self):
+        from splitter import is_conclusion
+        for slug in ("conclusion", "5-conclusions-and-future-work", "6conclusion", "concluding-remarks"):
+            self.assertTrue(is_conclusion(slug), slug)
+
+    def test_non_matches(self):
+        from splitter import is_conclusion
+        for slug in ("introduction", "conclude", "discussion"):
+            self.assertFalse(is_conclusion(slug), slug)
+
+
+class TestParseSections(unittest.TestCase):
+    """parse_sections: Markdown 标题应被解析为嵌套的 Section 树"""
+
+    def setUp(self):
+        from splitter import parse_sections
+        self.parse = parse_sections
+
+    def test_nested_tree(self):
+        md = (
+            "# 1 Intro\n\nIntro text.\n\n"
+            "## 1.1 Background\n\nBg text.\n\n"
+            "## 1.2 Scope\n\nScope text.\n\n"
+            "# 2 Method\n\nMethod text.\n"
+        )
+        sections = self.parse(md)
+
+        self.assertEqual([s.title for s in sections], ["1 Intro", "2 Method"])
+        intro = sections[0]
+        self.assertEqual(intro.intro, "Intro text.")
+        self.assertEqual([c.title for c in intro.children], ["1.1 Background", "1.2 Scope"])
+        self.assertEqual(intro.children[1].intro, "Scope text.")
+        self.assertEqual(sections[1].intro, "Method text.")
+
+    def test_skipped_levels_nest_under_nearest_parent(self):
+        """# 下直接出现 ####，应作为其子节"""
+        md = "# A\n#### A.x\ntext\n# B\n"
+        sections = self.parse(md)
+        self.assertEqual(len(sections), 2)
+        self.assertEqual(sections[0].children[0].title, "A.x")
+        self.assertEqual(sections[0].children[0].level, 4)
+        self.assertEqual(sections[0].intro, "")
+
+    def test_pandoc_attributes_stripped(self):
+        md = "# Introduction {#sec:intro}\n\nText.\n"
+        sections = self.parse(md)
+        self.assertEqual(sections[0].title, "Introduction")
+
+    def test_text_before_first_heading_ignored(self):
+        md = "preamble\n\n## A\nbody\n"
+        sections = self.parse(md)
+        self.assertEqual(len(sections), 1)
+        self.assertEqual(sections[0].intro, "body")
+
+    def test_bare_hash_line_is_not_heading(self):
+        """单独一行 # 不应把下一行当作标题"""
+        md = "# A\n#\nnot a heading\n"
+        sections = self.parse(md)
+        self.assertEqual([s.title for s in sections], ["A"])
+        self.assertEqual(sections[0].intro, "#\nnot a heading")
+
+    def test_bytes_input(self):
+        """bytes 输入：标题解码为 str，引言保持 UTF-8 bytes"""
+        md = "# 1 引言 {#sec:intro}\n\n正文。\n## 1.1 Über\nmore\n".encode("utf-8")
+        sections = self.parse(md)
+        self.assertEqual(sections[0].title, "1 引言")
+        self.assertEqual(sections[0].intro, "正文。".encode("utf-8"))
+        self.assertEqual(sections[0].children[0].title, "1.1 Über")
+        self.assertEqual(sections[0].children[0].intro, b"more")
+
+    def test_bytes_input_strips_unicode_whitespace(self):
+        """bytes 输入的引言首尾去空白与 str 输入一致（含 U+00A0、U+3000）"""
+        md = "# A\n\u00a0 \u3000正文\u3000\n\u00a0\n# B\n\x1c\u00a0\n"
+        by_text = [s.intro for s in self.parse(md)]
+        by_bytes = [s.intro.decode("utf-8") for s in self.parse(md.encode("utf-8"))]
+        self.assertEqual(by_bytes, by_text)
+        self.assertEqual(by_bytes, ["正文", ""])
+
+    def test_mmap_input(self):
+        import mmap
+        with tempfile.TemporaryFile() as f:
+            f.write("# A\n\nÄ text\n## B\nb\n".encode("utf-8"))
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                sections = self.parse(mm)
+        self.assertEqual(sections[0].intro, "Ä text".encode("utf-8"))
+        self.assertEqual(sections[0].children[0].title, "B")
+
+    def test_large_document(self):
+        """上千个章节、层级反复升降时，各节仍挂到正确的父节下"""
+        md = "".join(f"# S{i}\n## S{i}.1\n###### S{i}.1.x\ntext\n" for i in range(3000))
+        sections = self.parse(md)
+        self.assertEqual(len(sections), 3000)
+        last = sections[-1]
+        self.assertEqual(last.children[0].title, "S2999.1")
+        self.assertEqual(last.children[0].children[0].intro, "text")
+
+    def test_no_headings(self):
+        self.assertEqual(self.parse("just text\n"), [])
+
+
+class TestWriteSections(unittest.TestCase):
+    """write_sections: Section 树应写成带序号前缀的多级目录"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, md):
+        from splitter import parse_sections, write_sections
+        write_sections(parse_sections(md), self.tmp, top_level=True)
+        return sorted(str(p.relative_to(self.tmp)) for p in self.tmp.rglob("*"))
+
+    def test_directory_layout(self):
+        md = "# Intro\n\nHello.\n\n# Method\n\n## Setup\n\nSetup text.\n"
+        tree = self._write(md)
+        self.assertEqual(tree, [
+            "0_intro",
+            "0_intro/0_intro.md",
+            "1_method",
+            "1_method/0_setup",
+            "1_method/0_setup/0_setup.md",
+        ])
+        content = (self.tmp / "0_intro" / "0_intro.md").read_text(encoding="utf-8")
+        self.assertEqual(content, "# Intro\n\nHello.\n")
+
+    def test_bytes_input_written_verbatim(self):
+        from splitter import parse_sections, write_sections
+        write_sections(parse_sections("# Über\n\nÄ.\n".encode("utf-8")), self.tmp, top_level=True)
+        content = (self.tmp / "0_über" / "0_über.md").read_text(encoding="utf-8")
+        self.assertEqual(content, "# Über\n\nÄ.\n")
+
+    def test_collected_dirs_unique_and_parent_first(self):
+        """write_sections 逐个 mkdir 不带 parents=True，依赖目录列表无重复且父目录在前"""
+        from splitter import _collect_sections, parse_sections
+        md = "# A\n## A1\n### A1a\nx\n## A2\ny\n# Conclusion\nz\n# P\n## P1\nw\n# Q\nv\n"
+        dirs, _files = _collect_sections(parse_sections(md), self.tmp, top_level=True)
+        self.assertEqual(len(dirs), len(set(dirs)))
+        seen = {self.tmp}
+        for d in dirs:
+            self.assertIn(d.parent, seen)
+            seen.add(d)
+
+    def test_sections_after_conclusion_go_to_appendix(self):
+        md = "# Intro\nA\n# Conclusion\nB\n# Proofs\nC\n# More\nD\n"
+        tree = self._write(md)
+        self.assertIn("1_conclusion/1_conclusion.md", tree)
+        self.assertIn("2_appendix/0_proofs/0_proofs.md", tree)
+        self.assertIn("2_appendix/1_more/1_more.md", tree)
+
+
+class TestCopyFigures(unittest.TestCase):
+    """copy_figures: 递归查找图片并平铺复制到 figures/"""
+
+    def setUp(self):
+        self.src = Path(tempfile.mkdtemp())
+        self.dst = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.src)
+        shutil.rmtree(self.dst)
+
+    def test_images_flattened(self):
+        from splitter import copy_figures
+        (self.src / "figs" / "sub").mkdir(parents=True)
+        (self.src / "a.PNG").write_bytes(b"png")
+        (self.src / "figs" / "b.pdf").write_bytes(b"pdf")
+        (self.src / "figs" / "sub" / "c.jpeg").write_bytes(b"jpeg")
+        (self.src / "main.tex").write_text("tex")
+        (self.src / "figs" / "notes.txt").write_text("txt")
+
+        copy_figures(self.src, self.dst)
+
+        self.assertEqual(sorted(p.name for p in self.dst.iterdir()), ["a.PNG", "b.pdf", "c.jpeg"])
+        self.assertEqual((self.dst / "c.jpeg").read_bytes(), b"jpeg")
+
+    def test_copy_file_range_fallback(self):
+        """copy_file_range 出错或提前返回 0 时退回 shutil.copyfile，目标文件内容完整"""
+        import os
+        from unittest import mock
+        from splitter import copy_figures
+        (self.src / "a.png").write_bytes(b"x" * 1000)
+
+        def raise_oserror(*args):
+            raise OSError("unsupported")
+
+        for fake in (lambda *args: 0, raise_oserror):
+            with mock.patch.object(os, "copy_file_range", fake, create=True):
+                copy_figures(self.src, self.dst)
+            self.assertEqual((self.dst / "a.png").read_bytes(), b"x" * 1000)
+            (self.dst / "a.png").unlink()
+
+    def test_duplicate_names_written_once(self):
+        from splitter import copy_figures
+        (self.src / "a").mkdir()
+        (self.src / "b").mkdir()
+        (self.src / "a" / "fig.png").write_bytes(b"a")
+        (self.src / "b" / "fig.png").write_bytes(b"b")
+
+        copy_figures(self.src, self.dst)
+
+        self.assertEqual([p.name for p in self.dst.iterdir()], ["fig.png"])
+        self.assertIn((self.dst / "fig.png").read_bytes(), (b"a", b"b"))
+
+
+if __name__ == "__main__":
+    unittest.main()